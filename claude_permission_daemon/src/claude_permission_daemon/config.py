@@ -54,6 +54,7 @@ class DaemonConfig:
     idle_timeout: int = DEFAULT_IDLE_TIMEOUT
     request_timeout: int = DEFAULT_REQUEST_TIMEOUT
     debug: bool = False
+    warmup: bool = False
 
 
 @dataclass
@@ -157,6 +158,7 @@ class Config:
             idle_timeout=daemon_data.get("idle_timeout", DEFAULT_IDLE_TIMEOUT),
             request_timeout=daemon_data.get("request_timeout", DEFAULT_REQUEST_TIMEOUT),
             debug=daemon_data.get("debug", False),
+            warmup=daemon_data.get("warmup", False),
         )
 
         slack_config = SlackConfig(
@@ -208,6 +210,8 @@ class Config:
             self.daemon.socket_path = Path(socket_path)
         if debug := os.environ.get("CLAUDE_PERM_DEBUG"):
             self.daemon.debug = debug.lower() in ("1", "true", "yes")
+        if warmup := os.environ.get("CLAUDE_PERM_WARMUP"):
+            self.daemon.warmup = warmup.lower() in ("1", "true", "yes")
 
         # Swayidle overrides
         if swayidle_binary := os.environ.get("CLAUDE_PERM_SWAYIDLE_BINARY"):
@@ -27,6 +27,15 @@ from .state import (
 
 logger = logging.getLogger(__name__)
 
+# uvloop is an optional speedup (install with the "fast" extra; not on Windows)
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    uvloop = None  # type: ignore
+    UVLOOP_AVAILABLE = False
+
 
 class Daemon:
     """Main daemon class coordinating all components."""
@@ -69,6 +78,7 @@ class Daemon:
             socket_path=self._config.daemon.socket_path,
             on_request=self._handle_permission_request,
             on_notification=self._handle_notification,
+            warmup=self._config.daemon.warmup,
         )
         await self._socket_server.start()
 
@@ -122,7 +132,7 @@ class Daemon:
 
         # Cancel any monitor tasks and send passthrough to pending requests
         logger.debug("Clearing pending requests...")
-        pending = await self._state.clear_all_pending()
+        pending = self._state.clear_all_pending_nowait()
         for p in pending:
             # Cancel monitor task if running
             if p.monitor_task and not p.monitor_task.done():
@@ -167,7 +177,7 @@ class Daemon:
 
         # User became active - resolve pending requests
         logger.debug("User became active - resolving pending requests")
-        pending = await self._state.get_all_pending_requests()
+        pending = self._state.get_all_pending_requests_nowait()
 
         for p in pending:
             if p.slack_message_ts and p.slack_channel and self._slack_handler:
@@ -206,7 +216,7 @@ class Daemon:
             hook_writer=writer,
             hook_reader=reader,
         )
-        await self._state.add_pending_request(pending)
+        self._state.add_pending_request_nowait(pending)
 
         # Check if user is idle
         state_desc = self._state.get_state_description()
@@ -418,7 +428,8 @@ class Daemon:
             action=Action.PASSTHROUGH,
             reason="Daemon shutting down",
         )
-        await send_response(pending.hook_writer, response)
+        # The loop may stop soon after, so let the close finish
+        await send_response(pending.hook_writer, response, await_close=True)
 
     async def _handle_notification(self, notification: Notification) -> None:
         """Handle an incoming notification from hook script.
@@ -465,6 +476,17 @@ class Daemon:
             )
 
 
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create the daemon's event loop, using uvloop when it is installed.
+
+    Returns:
+        A new uvloop loop if available, otherwise a default asyncio loop.
+    """
+    if UVLOOP_AVAILABLE:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
 def setup_logging(debug: bool = False) -> None:
     """Configure logging for the daemon.
 
@@ -556,7 +578,7 @@ def main() -> None:
     daemon = Daemon(config)
 
     # Set up signal handlers
-    loop = asyncio.new_event_loop()
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
 
     for sig in (signal.SIGTERM, signal.SIGINT):
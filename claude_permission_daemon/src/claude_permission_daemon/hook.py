@@ -20,6 +20,7 @@ import platform
 import socket
 import sys
 from pathlib import Path
+from typing import TextIO
 
 
 def _get_default_socket_path() -> Path:
@@ -74,14 +75,20 @@ def get_timeout() -> int:
     return DEFAULT_TIMEOUT
 
 
-def read_request_from_stdin() -> dict | None:
+def read_request_from_stdin(stream: TextIO | None = None) -> dict | None:
     """Read and parse the permission request from stdin.
 
+    Args:
+        stream: Text stream to read from. Defaults to sys.stdin.
+
     Returns:
         Parsed request dict, or None if parsing fails.
     """
+    if stream is None:
+        stream = sys.stdin
+
     try:
-        data = sys.stdin.read()
+        data = stream.read()
         if not data:
             return None
         return json.loads(data)
@@ -5,17 +5,29 @@ and notifications, and sends responses back (for permission requests only).
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
+import socket
 import stat
+import sys
 from pathlib import Path
 from typing import Callable, Coroutine
 
-from .state import Notification, PermissionRequest, PermissionResponse
+from .state import Action, Notification, PermissionRequest, PermissionResponse
 
 logger = logging.getLogger(__name__)
 
+# orjson is an optional speedup (install with the "fast" extra); fall back to stdlib
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
+
 # Type alias for permission request handler callback
 RequestHandler = Callable[
     [PermissionRequest, asyncio.StreamReader, asyncio.StreamWriter],
@@ -28,8 +40,85 @@ NotificationHandler = Callable[
     Coroutine[None, None, None],
 ]
 
+# Socket file mode: user read/write only
+SOCKET_MODE = stat.S_IRUSR | stat.S_IWUSR
+
+# Maximum size of a single request line. Large enough for Write/Edit tool
+# input with sizeable file contents, small enough to bound per-connection memory.
+MAX_REQUEST_SIZE = 1024 * 1024
+
 # Notification types to ignore (handled by existing permission system)
-IGNORED_NOTIFICATION_TYPES = {"permission_prompt"}
+IGNORED_NOTIFICATION_TYPES: frozenset[str] = frozenset({"permission_prompt"})
+
+# Raw-frame patterns for ignored notification types, in both the hook's default
+# json.dumps spacing and compact form, so they can be dropped before parsing
+_IGNORED_NOTIFICATION_PATTERNS: tuple[bytes, ...] = tuple(
+    f'"notification_type"{sep}"{notification_type}"'.encode()
+    for notification_type in sorted(IGNORED_NOTIFICATION_TYPES)
+    for sep in (": ", ":")
+)
+
+
+def _is_ignored_notification_frame(data: bytes) -> bool:
+    """Check whether a raw frame is an ignored notification, without parsing.
+
+    Quotes inside JSON strings are escaped, so a pattern match is a real
+    key/value pair. The frame must also look like a single hook notification
+    object: wrapped in braces, carrying a hook_event_name key and no tool_name
+    key, with exactly one notification_type key so a nested pair cannot stand
+    in for the top-level one. A frame whose only notification_type key is
+    nested, with none at the top level, is still dropped; the hook never sends
+    that shape.
+    """
+    frame = data.strip()
+    return (
+        frame.startswith(b"{")
+        and frame.endswith(b"}")
+        and b'"tool_name"' not in frame
+        and b'"hook_event_name"' in frame
+        and frame.count(b'"notification_type"') == 1
+        and any(pattern in frame for pattern in _IGNORED_NOTIFICATION_PATTERNS)
+    )
+
+
+def _encode_line(data: dict) -> bytes:
+    """Encode a dict as a compact, newline-terminated JSON line.
+
+    Uses orjson when available. The stdlib fallback uses the same compact
+    separators and emits non-ASCII text as raw UTF-8, as orjson does, so the
+    wire format is identical either way.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n").encode()
+
+
+@functools.lru_cache(maxsize=64)
+def _encode_response(action: Action, reason: str) -> bytes:
+    """Encode a permission response line, cached per (action, reason).
+
+    The daemon answers with a small set of fixed reasons ("Approved via
+    Slack", "Daemon shutting down", ...), so repeated decisions reuse the
+    already-encoded bytes instead of re-serializing.
+    """
+    return _encode_line({"action": action.value, "reason": reason})
+
+
+# Pre-encoded responses for error paths whose message never varies
+_ERR_FRAME_TOO_LARGE = _encode_line({"error": "Frame too large"})
+_ERR_MISSING_TOOL_NAME = _encode_line({"error": "Missing required field: tool_name"})
+
+
+def _decode_line(data: bytes) -> dict:
+    """Decode a newline-terminated JSON line read from a hook connection.
+
+    Both decoders accept bytes directly, so no intermediate str is built.
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+    need to catch the latter.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class SocketServerError(Exception):
@@ -50,6 +139,7 @@ class SocketServer:
         socket_path: Path,
         on_request: RequestHandler,
         on_notification: NotificationHandler | None = None,
+        warmup: bool = False,
     ) -> None:
         """Initialize the socket server.
 
@@ -60,10 +150,13 @@ class SocketServer:
                         sending the response later.
             on_notification: Optional async callback called when a notification
                             is received. Notifications are one-way (no response).
+            warmup: Open a loopback connection once listening, so the first
+                    real request doesn't pay the one-time accept path cost.
         """
         self._socket_path = socket_path
         self._on_request = on_request
         self._on_notification = on_notification
+        self._warmup = warmup
         self._server: asyncio.Server | None = None
         self._running = False
         self._active_connections: set[asyncio.StreamWriter] = set()
@@ -96,20 +189,46 @@ class SocketServer:
         # Ensure parent directory exists
         self._socket_path.parent.mkdir(parents=True, exist_ok=True)
 
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         try:
+            # On Linux, bind() creates the socket file with the fd's mode, so
+            # restricting it first means the path is never reachable with a
+            # looser umask-derived mode. Other platforms chmod after bind.
+            if sys.platform == "linux":
+                os.fchmod(sock.fileno(), SOCKET_MODE)
+            sock.bind(str(self._socket_path))
+            if sys.platform != "linux":
+                os.chmod(self._socket_path, SOCKET_MODE)
+            sock.setblocking(False)
             self._server = await asyncio.start_unix_server(
                 self._handle_connection,
-                path=str(self._socket_path),
+                sock=sock,
+                limit=MAX_REQUEST_SIZE,
             )
         except OSError as e:
+            sock.close()
             raise SocketServerError(f"Failed to create socket: {e}") from e
 
-        # Set socket permissions to user-only (0600)
-        os.chmod(self._socket_path, stat.S_IRUSR | stat.S_IWUSR)
-
         self._running = True
         logger.info(f"SocketServer listening on {self._socket_path}")
 
+        if self._warmup:
+            await self._warm_up()
+
+    async def _warm_up(self) -> None:
+        """Exercise the accept path before real traffic.
+
+        The loopback connection is closed without sending anything, which the
+        connection handler treats as a no-op, so no request is created.
+        """
+        try:
+            _, writer = await asyncio.open_unix_connection(str(self._socket_path))
+            writer.close()
+            await writer.wait_closed()
+        except OSError as e:
+            logger.warning(f"SocketServer warm-up connection failed: {e}")
+        logger.debug("SocketServer warm-up complete")
+
     async def stop(self) -> None:
         """Stop the socket server and close all connections."""
         if not self._running:
@@ -185,14 +304,27 @@ class SocketServer:
             except asyncio.TimeoutError:
                 logger.warning(f"Connection from {peer} timed out waiting for request")
                 return
+            except ValueError:
+                # readline() raises ValueError once a line exceeds the stream limit
+                logger.error(f"Request from {peer} exceeds {MAX_REQUEST_SIZE} bytes")
+                await send_response(writer, _ERR_FRAME_TOO_LARGE)
+                return
 
             if not data:
                 logger.debug(f"Connection from {peer} closed without data")
                 return
 
+            # Fast path: drop ignored notifications without parsing
+            if _is_ignored_notification_frame(data):
+                logger.debug(
+                    f"Ignoring notification from {peer} (handled by permission system)"
+                )
+                await _close_quietly(writer)
+                return
+
             # Parse the JSON request
             try:
-                request_data = json.loads(data.decode())
+                request_data = _decode_line(data)
             except json.JSONDecodeError as e:
                 logger.error(f"Invalid JSON from {peer}: {e}")
                 await self._send_error(writer, f"Invalid JSON: {e}")
@@ -241,11 +373,7 @@ class SocketServer:
                 f"(handled by permission system)"
             )
             # Close connection immediately - no response needed
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
+            await _close_quietly(writer)
             return
 
         # Check if we have a notification handler
@@ -254,11 +382,7 @@ class SocketServer:
                 f"No notification handler configured, ignoring notification "
                 f"of type '{notification_type}'"
             )
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
+            await _close_quietly(writer)
             return
 
         # Create the notification
@@ -280,11 +404,7 @@ class SocketServer:
             logger.exception(f"Error in notification handler for {notification_type}")
 
         # Close connection - no response needed for notifications
-        try:
-            writer.close()
-            await writer.wait_closed()
-        except Exception:
-            pass
+        await _close_quietly(writer)
 
     async def _handle_permission_request(
         self,
@@ -304,7 +424,7 @@ class SocketServer:
         # Validate required fields
         if "tool_name" not in request_data:
             logger.error(f"Missing tool_name from {peer}")
-            await self._send_error(writer, "Missing required field: tool_name")
+            await send_response(writer, _ERR_MISSING_TOOL_NAME)
             return
 
         # Create the permission request
@@ -338,30 +458,49 @@ class SocketServer:
         await send_response(writer, error_response)
 
 
+async def _close_quietly(writer: asyncio.StreamWriter) -> None:
+    """Close a connection and wait for it, ignoring errors from the peer."""
+    try:
+        writer.close()
+        await writer.wait_closed()
+    except Exception:
+        pass
+
+
 async def send_response(
     writer: asyncio.StreamWriter,
-    response: PermissionResponse | dict,
+    response: PermissionResponse | dict | bytes,
+    *,
+    await_close: bool = False,
 ) -> None:
     """Send a response to a hook script and close the connection.
 
+    Responses are a single small line that drain() has already handed to the
+    transport, so by default the connection is closed without waiting for the
+    close to complete.
+
     Args:
         writer: Stream writer for the connection.
-        response: PermissionResponse or dict to send.
+        response: PermissionResponse or dict to send, or an already-encoded
+            newline-terminated response line.
+        await_close: Wait for the connection to finish closing, for callers
+            that must not move on until it has (e.g. at shutdown).
     """
     try:
-        if isinstance(response, PermissionResponse):
-            data = response.to_dict()
-        else:
-            data = response
-
         # Check if writer is in a valid state
         if writer.is_closing():
             logger.error("Cannot send response: writer is already closing")
             return
 
-        json_data = json.dumps(data) + "\n"
-        logger.debug(f"Sending response: {json_data.strip()}")
-        writer.write(json_data.encode())
+        if isinstance(response, PermissionResponse):
+            payload = _encode_response(response.action, response.reason)
+        elif isinstance(response, bytes):
+            payload = response
+        else:
+            payload = _encode_line(response)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sending response: {payload.decode().strip()}")
+        writer.write(payload)
         await writer.drain()
         logger.debug("Response sent and drained successfully")
     except ConnectionResetError:
@@ -373,7 +512,8 @@ async def send_response(
     finally:
         try:
             writer.close()
-            await writer.wait_closed()
+            if await_close:
+                await writer.wait_closed()
             logger.debug("Writer closed")
         except Exception:
             pass
@@ -8,7 +8,7 @@ import logging
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
-from typing import Callable, Coroutine
+from typing import Callable, Coroutine, Iterable
 from uuid import uuid4
 
 logger = logging.getLogger(__name__)
@@ -29,7 +29,7 @@ class MessageType(Enum):
     NOTIFICATION = "notification"
 
 
-@dataclass
+@dataclass(slots=True)
 class PermissionRequest:
     """A permission request from Claude Code via the hook."""
 
@@ -48,7 +48,7 @@ class PermissionRequest:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Notification:
     """A one-way notification from Claude Code via the Notification hook.
 
@@ -77,7 +77,7 @@ class Notification:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PermissionResponse:
     """Response to a permission request."""
 
@@ -92,7 +92,7 @@ class PermissionResponse:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingRequest:
     """Internal tracking of a pending permission request.
 
@@ -121,6 +121,8 @@ class StateManager:
     """Manages daemon state including idle status and pending requests.
 
     Thread-safe via asyncio locks. Provides callbacks for state changes.
+    The ``*_nowait`` variants skip the lock for callers already running on
+    the event loop thread, where dict access cannot interleave.
     """
 
     def __init__(self) -> None:
@@ -172,6 +174,13 @@ class StateManager:
         """
         self._idle_callbacks.append(callback)
 
+    def register_idle_callbacks(self, callbacks: Iterable[IdleStateCallback]) -> None:
+        """Register several idle state callbacks at once.
+
+        Equivalent to calling register_idle_callback() for each, in order.
+        """
+        self._idle_callbacks.extend(callbacks)
+
     async def set_idle(self, idle: bool) -> None:
         """Set the idle state and notify callbacks if changed."""
         async with self._lock:
@@ -195,11 +204,18 @@ class StateManager:
             except Exception:
                 logger.exception("Error in idle state callback")
 
+    def add_pending_request_nowait(self, pending: PendingRequest) -> None:
+        """Add a pending request to track without taking the lock.
+
+        Must be called from the event loop thread.
+        """
+        self._pending_requests[pending.request_id] = pending
+        logger.debug(f"Added pending request: {pending.request_id}")
+
     async def add_pending_request(self, pending: PendingRequest) -> None:
         """Add a pending request to track."""
         async with self._lock:
-            self._pending_requests[pending.request_id] = pending
-            logger.debug(f"Added pending request: {pending.request_id}")
+            self.add_pending_request_nowait(pending)
 
     async def get_pending_request(self, request_id: str) -> PendingRequest | None:
         """Get a pending request by ID."""
@@ -214,10 +230,17 @@ class StateManager:
                 logger.debug(f"Removed pending request: {request_id}")
             return pending
 
+    def get_all_pending_requests_nowait(self) -> list[PendingRequest]:
+        """Get a list of all pending requests without taking the lock.
+
+        Must be called from the event loop thread.
+        """
+        return list(self._pending_requests.values())
+
     async def get_all_pending_requests(self) -> list[PendingRequest]:
         """Get a list of all pending requests."""
         async with self._lock:
-            return list(self._pending_requests.values())
+            return self.get_all_pending_requests_nowait()
 
     async def update_slack_info(
         self, request_id: str, message_ts: str, channel: str
@@ -238,10 +261,17 @@ class StateManager:
                 pending.monitor_task = task
                 logger.debug(f"Set monitor task for {request_id}")
 
+    def clear_all_pending_nowait(self) -> list[PendingRequest]:
+        """Clear and return all pending requests without taking the lock.
+
+        Must be called from the event loop thread.
+        """
+        pending = list(self._pending_requests.values())
+        self._pending_requests.clear()
+        logger.debug(f"Cleared {len(pending)} pending requests")
+        return pending
+
     async def clear_all_pending(self) -> list[PendingRequest]:
         """Clear and return all pending requests."""
         async with self._lock:
-            pending = list(self._pending_requests.values())
-            self._pending_requests.clear()
-            logger.debug(f"Cleared {len(pending)} pending requests")
-            return pending
+            return self.clear_all_pending_nowait()
@@ -3,9 +3,29 @@
 import asyncio
 import tempfile
 from pathlib import Path
-from typing import Generator
+from typing import AsyncIterator, Callable, Generator
 
 import pytest
+import pytest_asyncio
+
+from claude_permission_daemon.socket_server import RequestHandler, SocketServer
+from claude_permission_daemon.state import PermissionRequest
+from tests.helpers import SharedServer
+
+# uvloop is used for test event loops where available (it does not support Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # type: ignore
+
+
+if uvloop is not None:
+
+    def pytest_asyncio_loop_factories(
+        config: pytest.Config, item: pytest.Item
+    ) -> dict[str, Callable[[], asyncio.AbstractEventLoop]]:
+        """Run async tests on uvloop instead of the default selector loop."""
+        return {"uvloop": uvloop.new_event_loop}
 
 
 @pytest.fixture
@@ -59,3 +79,53 @@ def minimal_config_file(temp_dir: Path, minimal_config_content: str) -> Path:
     config_path = temp_dir / "config.toml"
     config_path.write_text(minimal_config_content)
     return config_path
+
+
+@pytest_asyncio.fixture(scope="module")
+async def shared_socket_server(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> AsyncIterator[tuple[Path, list[RequestHandler | None]]]:
+    """Provide one listening SocketServer per test module.
+
+    Yields (socket_path, handler_slot). Requests are dispatched to the
+    handler in handler_slot[0]; use the shared_server fixture to set it.
+    """
+    socket_path = tmp_path_factory.mktemp("shared-server") / "test.sock"
+    handler_slot: list[RequestHandler | None] = [None]
+
+    async def dispatch(
+        request: PermissionRequest,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        if (handler := handler_slot[0]) is None:
+            writer.close()
+            raise RuntimeError("shared_server request arrived before set_handler()")
+        await handler(request, reader, writer)
+
+    server = SocketServer(socket_path=socket_path, on_request=dispatch)
+    await server.start()
+    try:
+        yield socket_path, handler_slot
+    finally:
+        await server.stop()
+
+
+@pytest.fixture
+def shared_server(
+    shared_socket_server: tuple[Path, list[RequestHandler | None]],
+) -> Generator[SharedServer, None, None]:
+    """Provide the module's shared SocketServer to a single test.
+
+    Yields (socket_path, set_handler). Each test installs its own request
+    handler with set_handler() before connecting, so start/stop and socket
+    setup are paid once per module rather than per test. The handler is
+    cleared again when the test finishes.
+    """
+    socket_path, handler_slot = shared_socket_server
+
+    def set_handler(handler: RequestHandler) -> None:
+        handler_slot[0] = handler
+
+    yield socket_path, set_handler
+    handler_slot[0] = None
@@ -0,0 +1,19 @@
+"""Shared test helpers for claude_permission_daemon tests."""
+
+from pathlib import Path
+from typing import Callable
+
+from claude_permission_daemon.socket_server import RequestHandler
+
+# (socket_path, set_handler) yielded by the shared_server fixture
+SharedServer = tuple[Path, Callable[[RequestHandler], None]]
+
+
+class AsyncRecorder:
+    """Minimal async callable that records the arguments of each call."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[tuple, dict]] = []
+
+    async def __call__(self, *args, **kwargs) -> None:
+        self.calls.append((args, kwargs))
@@ -17,6 +17,7 @@ from claude_permission_daemon.config import (
 )
 
 
+@pytest.mark.fast
 class TestDaemonConfig:
     """Tests for DaemonConfig dataclass."""
 
@@ -26,8 +27,10 @@ class TestDaemonConfig:
         assert config.idle_timeout == DEFAULT_IDLE_TIMEOUT
         assert config.request_timeout == DEFAULT_REQUEST_TIMEOUT
         assert isinstance(config.socket_path, Path)
+        assert config.warmup is False
 
 
+@pytest.mark.fast
 class TestSlackConfig:
     """Tests for SlackConfig dataclass."""
 
@@ -70,6 +73,7 @@ class TestSlackConfig:
         assert len(errors) == 0
 
 
+@pytest.mark.fast
 class TestSwayidleConfig:
     """Tests for SwayidleConfig dataclass."""
 
@@ -162,6 +166,7 @@ class TestConfig:
             "CLAUDE_PERM_REQUEST_TIMEOUT": "600",
             "CLAUDE_PERM_SOCKET_PATH": "/tmp/env-socket.sock",
             "CLAUDE_PERM_SWAYIDLE_BINARY": "/custom/swayidle",
+            "CLAUDE_PERM_WARMUP": "yes",
         }
 
         with mock.patch.dict(os.environ, env_overrides, clear=False):
@@ -173,6 +178,7 @@ class TestConfig:
         assert config.daemon.idle_timeout == 120
         assert config.daemon.request_timeout == 600
         assert config.daemon.socket_path == Path("/tmp/env-socket.sock")
+        assert config.daemon.warmup is True
         assert config.swayidle.binary == "/custom/swayidle"
 
     def test_env_var_partial_override(self, config_file: Path) -> None:
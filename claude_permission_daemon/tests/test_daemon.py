@@ -9,8 +9,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from claude_permission_daemon import daemon as daemon_module
 from claude_permission_daemon.config import Config, DaemonConfig, SlackConfig, SwayidleConfig
-from claude_permission_daemon.daemon import Daemon, setup_logging, parse_args
+from claude_permission_daemon.daemon import Daemon, new_event_loop, parse_args, setup_logging
 from claude_permission_daemon.state import (
     Action,
     Notification,
@@ -260,6 +261,7 @@ class TestDaemonStartStop:
             call_args = mock_send.call_args
             assert call_args[0][0] is mock_writer
             assert call_args[0][1].action == Action.PASSTHROUGH
+            assert call_args.kwargs == {"await_close": True}
 
     async def test_request_shutdown_sets_event(self, test_config: Config) -> None:
         """Test that request_shutdown sets the shutdown event."""
@@ -963,6 +965,20 @@ class TestHelperFunctions:
         finally:
             sys.argv = original_argv
 
+    @pytest.mark.parametrize("use_uvloop", [True, False])
+    def test_new_event_loop(self, use_uvloop: bool) -> None:
+        """Test new_event_loop uses uvloop only when available."""
+        if use_uvloop and not daemon_module.UVLOOP_AVAILABLE:
+            pytest.skip("uvloop not installed")
+
+        with patch.object(daemon_module, "UVLOOP_AVAILABLE", use_uvloop):
+            loop = new_event_loop()
+        try:
+            is_uvloop = type(loop).__module__.startswith("uvloop")
+            assert is_uvloop is use_uvloop
+        finally:
+            loop.close()
+
 
 class TestDaemonNotificationHandling:
     """Tests for notification handling."""
@@ -1098,5 +1114,6 @@ class TestDaemonNotificationHandling:
             call_kwargs = mock_socket_cls.call_args[1]
             assert "on_notification" in call_kwargs
             assert call_kwargs["on_notification"] == daemon._handle_notification
+            assert call_kwargs["warmup"] is False
 
             await daemon.stop()
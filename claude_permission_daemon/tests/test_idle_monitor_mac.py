@@ -164,6 +164,9 @@ class TestMacIdleMonitor:
         assert monitor.running is True
         assert monitor.idle is False
 
+        # Stop the background poll task so it doesn't outlive the test
+        await monitor.stop()
+
     async def test_start_already_running(self, monitor: MacIdleMonitor) -> None:
         """Test start when already running does nothing."""
         monitor._running = True
@@ -341,6 +344,9 @@ class TestMacIdleMonitor:
         assert monitor.running is True
         assert monitor.idle is False
 
+        # Stop the background poll task so it doesn't outlive the test
+        await monitor.stop()
+
 
 class TestMacIdleMonitorParseOutput:
     """Tests for ioreg output parsing."""
@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from claude_permission_daemon import idle_monitor_windows
 from claude_permission_daemon.idle_monitor_windows import (
     WindowsIdleMonitor,
     IdleMonitorError,
@@ -46,11 +47,11 @@ class TestWindowsIdleMonitor:
         mock_lastinputinfo.dwTime = 5000  # 5 seconds ago
         mock_lastinputinfo.cbSize = 8
 
-        with patch("claude_permission_daemon.idle_monitor_windows.WINDOWS_AVAILABLE", True):
-            with patch("claude_permission_daemon.idle_monitor_windows.windll", mock_windll):
-                with patch("claude_permission_daemon.idle_monitor_windows.sizeof", return_value=8):
-                    with patch("claude_permission_daemon.idle_monitor_windows.byref", side_effect=lambda x: x):
-                        with patch("claude_permission_daemon.idle_monitor_windows.LASTINPUTINFO", return_value=mock_lastinputinfo):
+        with patch.object(idle_monitor_windows, "WINDOWS_AVAILABLE", True):
+            with patch.object(idle_monitor_windows, "windll", mock_windll):
+                with patch.object(idle_monitor_windows, "sizeof", return_value=8):
+                    with patch.object(idle_monitor_windows, "byref", side_effect=lambda x: x):
+                        with patch.object(idle_monitor_windows, "LASTINPUTINFO", return_value=mock_lastinputinfo):
                             idle_seconds = monitor._get_idle_time_seconds()
 
         # Idle time should be (10000 - 5000) / 1000 = 5 seconds
@@ -61,7 +62,7 @@ class TestWindowsIdleMonitor:
         mock_windll = MagicMock()
         mock_windll.user32.GetLastInputInfo.return_value = False
 
-        with patch("claude_permission_daemon.idle_monitor_windows.windll", mock_windll):
+        with patch.object(idle_monitor_windows, "windll", mock_windll):
             idle_seconds = monitor._get_idle_time_seconds()
 
         assert idle_seconds is None
@@ -71,8 +72,9 @@ class TestWindowsIdleMonitor:
     ) -> None:
         """Test when Windows API is not available."""
         # Mock windll to raise AttributeError (not on Windows)
-        with patch(
-            "claude_permission_daemon.idle_monitor_windows.windll",
+        with patch.object(
+            idle_monitor_windows,
+            "windll",
             side_effect=AttributeError("windll not available"),
         ):
             idle_seconds = monitor._get_idle_time_seconds()
@@ -84,7 +86,7 @@ class TestWindowsIdleMonitor:
         mock_windll = MagicMock()
         mock_windll.user32.GetLastInputInfo.side_effect = Exception("API error")
 
-        with patch("claude_permission_daemon.idle_monitor_windows.windll", mock_windll):
+        with patch.object(idle_monitor_windows, "windll", mock_windll):
             idle_seconds = monitor._get_idle_time_seconds()
 
         assert idle_seconds is None
@@ -101,11 +103,11 @@ class TestWindowsIdleMonitor:
         mock_lastinputinfo.dwTime = 4294967290  # Near max DWORD
         mock_lastinputinfo.cbSize = 8
 
-        with patch("claude_permission_daemon.idle_monitor_windows.WINDOWS_AVAILABLE", True):
-            with patch("claude_permission_daemon.idle_monitor_windows.windll", mock_windll):
-                with patch("claude_permission_daemon.idle_monitor_windows.sizeof", return_value=8):
-                    with patch("claude_permission_daemon.idle_monitor_windows.byref", side_effect=lambda x: x):
-                        with patch("claude_permission_daemon.idle_monitor_windows.LASTINPUTINFO", return_value=mock_lastinputinfo):
+        with patch.object(idle_monitor_windows, "WINDOWS_AVAILABLE", True):
+            with patch.object(idle_monitor_windows, "windll", mock_windll):
+                with patch.object(idle_monitor_windows, "sizeof", return_value=8):
+                    with patch.object(idle_monitor_windows, "byref", side_effect=lambda x: x):
+                        with patch.object(idle_monitor_windows, "LASTINPUTINFO", return_value=mock_lastinputinfo):
                             idle_seconds = monitor._get_idle_time_seconds()
 
         # Should handle rollover gracefully and return 0
@@ -120,6 +122,9 @@ class TestWindowsIdleMonitor:
         assert monitor.running is True
         assert monitor.idle is False
 
+        # Stop the background poll task so it doesn't outlive the test
+        await monitor.stop()
+
     async def test_start_already_running(self, monitor: WindowsIdleMonitor) -> None:
         """Test start when already running does nothing."""
         monitor._running = True
@@ -143,21 +148,14 @@ class TestWindowsIdleMonitor:
         """Test stop cancels running poll task."""
         monitor._running = True
 
-        # Create a real task that we can cancel
-        async def dummy_task():
-            try:
-                await asyncio.sleep(100)
-            except asyncio.CancelledError:
-                # Expected in this test: ignore cancellation of the dummy task.
-                pass
-
-        mock_task = asyncio.create_task(dummy_task())
-        monitor._poll_task = mock_task
+        # A bare future is enough for stop() to cancel; no need to schedule a task
+        poll_future = asyncio.get_running_loop().create_future()
+        monitor._poll_task = poll_future
 
         await monitor.stop()
 
         assert monitor.running is False
-        assert mock_task.cancelled() or mock_task.done()
+        assert poll_future.cancelled()
 
     async def test_run_without_start(self, monitor: WindowsIdleMonitor) -> None:
         """Test run raises if not started."""
@@ -300,6 +298,9 @@ class TestWindowsIdleMonitor:
         assert monitor.running is True
         assert monitor.idle is False
 
+        # Stop the background poll task so it doesn't outlive the test
+        await monitor.stop()
+
 
 class TestWindowsIdleMonitorTickCalculation:
     """Tests for tick count and idle time calculation."""
@@ -323,11 +324,11 @@ class TestWindowsIdleMonitorTickCalculation:
         mock_lastinputinfo.dwTime = 5000  # Same as current time
         mock_lastinputinfo.cbSize = 8
 
-        with patch("claude_permission_daemon.idle_monitor_windows.WINDOWS_AVAILABLE", True):
-            with patch("claude_permission_daemon.idle_monitor_windows.windll", mock_windll):
-                with patch("claude_permission_daemon.idle_monitor_windows.sizeof", return_value=8):
-                    with patch("claude_permission_daemon.idle_monitor_windows.byref", side_effect=lambda x: x):
-                        with patch("claude_permission_daemon.idle_monitor_windows.LASTINPUTINFO", return_value=mock_lastinputinfo):
+        with patch.object(idle_monitor_windows, "WINDOWS_AVAILABLE", True):
+            with patch.object(idle_monitor_windows, "windll", mock_windll):
+                with patch.object(idle_monitor_windows, "sizeof", return_value=8):
+                    with patch.object(idle_monitor_windows, "byref", side_effect=lambda x: x):
+                        with patch.object(idle_monitor_windows, "LASTINPUTINFO", return_value=mock_lastinputinfo):
                             idle_seconds = monitor._get_idle_time_seconds()
 
         assert idle_seconds == 0.0
@@ -344,11 +345,11 @@ class TestWindowsIdleMonitorTickCalculation:
         mock_lastinputinfo.dwTime = 0  # At system start
         mock_lastinputinfo.cbSize = 8
 
-        with patch("claude_permission_daemon.idle_monitor_windows.WINDOWS_AVAILABLE", True):
-            with patch("claude_permission_daemon.idle_monitor_windows.windll", mock_windll):
-                with patch("claude_permission_daemon.idle_monitor_windows.sizeof", return_value=8):
-                    with patch("claude_permission_daemon.idle_monitor_windows.byref", side_effect=lambda x: x):
-                        with patch("claude_permission_daemon.idle_monitor_windows.LASTINPUTINFO", return_value=mock_lastinputinfo):
+        with patch.object(idle_monitor_windows, "WINDOWS_AVAILABLE", True):
+            with patch.object(idle_monitor_windows, "windll", mock_windll):
+                with patch.object(idle_monitor_windows, "sizeof", return_value=8):
+                    with patch.object(idle_monitor_windows, "byref", side_effect=lambda x: x):
+                        with patch.object(idle_monitor_windows, "LASTINPUTINFO", return_value=mock_lastinputinfo):
                             idle_seconds = monitor._get_idle_time_seconds()
 
         assert idle_seconds == 3600.0  # 1 hour
@@ -364,11 +365,11 @@ class TestWindowsIdleMonitorTickCalculation:
         mock_lastinputinfo.dwTime = 10000
         mock_lastinputinfo.cbSize = 8
 
-        with patch("claude_permission_daemon.idle_monitor_windows.WINDOWS_AVAILABLE", True):
-            with patch("claude_permission_daemon.idle_monitor_windows.windll", mock_windll):
-                with patch("claude_permission_daemon.idle_monitor_windows.sizeof", return_value=8):
-                    with patch("claude_permission_daemon.idle_monitor_windows.byref", side_effect=lambda x: x):
-                        with patch("claude_permission_daemon.idle_monitor_windows.LASTINPUTINFO", return_value=mock_lastinputinfo):
+        with patch.object(idle_monitor_windows, "WINDOWS_AVAILABLE", True):
+            with patch.object(idle_monitor_windows, "windll", mock_windll):
+                with patch.object(idle_monitor_windows, "sizeof", return_value=8):
+                    with patch.object(idle_monitor_windows, "byref", side_effect=lambda x: x):
+                        with patch.object(idle_monitor_windows, "LASTINPUTINFO", return_value=mock_lastinputinfo):
                             idle_seconds = monitor._get_idle_time_seconds()
 
         # (12345 - 10000) / 1000 = 2.345 seconds
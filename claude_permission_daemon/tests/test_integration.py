@@ -4,14 +4,21 @@ Tests end-to-end scenarios focusing on component interactions.
 """
 
 import asyncio
+import contextlib
 import json
+from io import StringIO
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from claude_permission_daemon.config import Config, DaemonConfig, SlackConfig, SwayidleConfig
-from claude_permission_daemon.socket_server import SocketServer, send_response
+from claude_permission_daemon.hook import (
+    connect_to_daemon,
+    format_output,
+    read_request_from_stdin,
+)
+from claude_permission_daemon.socket_server import send_response
 from claude_permission_daemon.state import (
     Action,
     PendingRequest,
@@ -19,6 +26,33 @@ from claude_permission_daemon.state import (
     PermissionResponse,
     StateManager,
 )
+from tests.helpers import SharedServer
+
+
+# Shared across tests: the StateManager tests never call into the writer, so
+# there is no need to rebuild the spec'd mock each time
+_MOCK_WRITER = MagicMock(spec=asyncio.StreamWriter)
+
+# Pre-encoded wire requests for the end-to-end flow tests
+_BASH_NPM_INSTALL_REQUEST = (
+    b'{"tool_name":"Bash","tool_input":{"command":"npm install lodash"}}\n'
+)
+_BASH_RM_RF_REQUEST = b'{"tool_name":"Bash","tool_input":{"command":"rm -rf /"}}\n'
+_BASH_ECHO_TEST_REQUEST = b'{"tool_name":"Bash","tool_input":{"command":"echo test"}}\n'
+
+
+async def send_json(writer: asyncio.StreamWriter, payload: dict | bytes) -> None:
+    """Send one JSON request line and drain.
+
+    Args:
+        writer: Client stream writer connected to the server.
+        payload: Request dict to encode, or an already-encoded
+            newline-terminated request line.
+    """
+    if isinstance(payload, dict):
+        payload = json.dumps(payload).encode() + b"\n"
+    writer.write(payload)
+    await writer.drain()
 
 
 @pytest.fixture
@@ -39,54 +73,70 @@ def integration_config(temp_dir: Path) -> Config:
     )
 
 
+@pytest.mark.integration
 class TestSocketServerIntegration:
     """Integration tests for socket server with real connections."""
 
-    async def test_socket_server_full_flow(self, temp_dir: Path) -> None:
+    async def test_socket_server_full_flow(self, shared_server: SharedServer) -> None:
         """Test full request/response flow through socket server."""
-        socket_path = temp_dir / "test.sock"
-        received_requests = []
+        answered_requests = []
+        inbox: asyncio.Queue[tuple[PermissionRequest, asyncio.StreamWriter]] = (
+            asyncio.Queue()
+        )
 
         async def handler(
             request: PermissionRequest,
             reader: asyncio.StreamReader,
             writer: asyncio.StreamWriter,
         ):
-            received_requests.append(request)
-            response = PermissionResponse(Action.APPROVE, "Test approved")
-            await send_response(writer, response)
+            # Hand off to the consumer; responses are written outside the handler
+            inbox.put_nowait((request, writer))
+
+        async def consumer():
+            while True:
+                request, writer = await inbox.get()
+                response = PermissionResponse(Action.APPROVE, "Test approved")
+                await send_response(writer, response)
+                answered_requests.append(request)
+                inbox.task_done()
 
-        server = SocketServer(socket_path=socket_path, on_request=handler)
-        await server.start()
+        socket_path, set_handler = shared_server
+        set_handler(handler)
+        consumer_task = asyncio.create_task(consumer())
 
         try:
-            # Connect and send request
             reader, writer = await asyncio.open_unix_connection(str(socket_path))
-
             request = {
                 "tool_name": "Bash",
                 "tool_input": {"command": "echo hello"},
             }
-            writer.write(json.dumps(request).encode() + b"\n")
-            await writer.drain()
+            await send_json(writer, request)
 
             # Read response
-            response_data = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            async with asyncio.timeout(5.0):
+                response_data = await reader.readline()
             response = json.loads(response_data.decode())
 
             assert response["action"] == "approve"
             assert response["reason"] == "Test approved"
-            assert len(received_requests) == 1
-            assert received_requests[0].tool_name == "Bash"
 
+            # Wait for the consumer to finish with every queued request
+            async with asyncio.timeout(5.0):
+                await inbox.join()
+            assert [r.tool_name for r in answered_requests] == ["Bash"]
+            writer.close()
         finally:
-            await server.stop()
+            consumer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await consumer_task
 
-    async def test_multiple_concurrent_connections(self, temp_dir: Path) -> None:
+    async def test_multiple_concurrent_connections(
+        self, shared_server: SharedServer
+    ) -> None:
         """Test handling multiple concurrent connections."""
-        socket_path = temp_dir / "test.sock"
         received_count = 0
-        received_lock = asyncio.Lock()
+        # All handlers must be in flight at once before any of them responds
+        barrier = asyncio.Barrier(3)
 
         async def handler(
             request: PermissionRequest,
@@ -94,37 +144,32 @@ class TestSocketServerIntegration:
             writer: asyncio.StreamWriter,
         ):
             nonlocal received_count
-            async with received_lock:
-                received_count += 1
-            await asyncio.sleep(0.05)  # Simulate processing
+            received_count += 1  # no await between read and write, so no lock
+            await barrier.wait()
             response = PermissionResponse(Action.PASSTHROUGH, "Test")
             await send_response(writer, response)
 
-        server = SocketServer(socket_path=socket_path, on_request=handler)
-        await server.start()
+        socket_path, set_handler = shared_server
+        set_handler(handler)
 
-        try:
-            # Send multiple concurrent requests
-            async def send_request(n: int):
-                reader, writer = await asyncio.open_unix_connection(str(socket_path))
-                request = {"tool_name": f"Tool{n}", "tool_input": {}}
-                writer.write(json.dumps(request).encode() + b"\n")
-                await writer.drain()
-                return await asyncio.wait_for(reader.readline(), timeout=5.0)
+        # Send multiple concurrent requests
+        async def send_request(n: int):
+            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+            request = {"tool_name": f"Tool{n}", "tool_input": {}}
+            await send_json(writer, request)
+            return await reader.readline()
 
+        # One deadline covers all three reads
+        async with asyncio.timeout(5.0):
             results = await asyncio.gather(*[send_request(i) for i in range(3)])
 
-            assert received_count == 3
-            for result in results:
-                response = json.loads(result.decode())
-                assert response["action"] == "passthrough"
-
-        finally:
-            await server.stop()
+        assert received_count == 3
+        for result in results:
+            response = json.loads(result.decode())
+            assert response["action"] == "passthrough"
 
-    async def test_deferred_response(self, temp_dir: Path) -> None:
+    async def test_deferred_response(self, shared_server: SharedServer) -> None:
         """Test that responses can be sent after handler returns."""
-        socket_path = temp_dir / "test.sock"
         pending_writers = []
 
         async def handler(
@@ -135,35 +180,30 @@ class TestSocketServerIntegration:
             # Don't respond immediately - store writer for later
             pending_writers.append((request, writer))
 
-        server = SocketServer(socket_path=socket_path, on_request=handler)
-        await server.start()
+        socket_path, set_handler = shared_server
+        set_handler(handler)
 
-        try:
-            # Connect and send request
-            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        request = {"tool_name": "Bash", "tool_input": {}}
+        await send_json(writer, request)
 
-            request = {"tool_name": "Bash", "tool_input": {}}
-            writer.write(json.dumps(request).encode() + b"\n")
-            await writer.drain()
+        # Wait for handler to receive request
+        await asyncio.sleep(0.1)
+        assert len(pending_writers) == 1
 
-            # Wait for handler to receive request
-            await asyncio.sleep(0.1)
-            assert len(pending_writers) == 1
+        # Now send response through stored writer
+        req, pending_writer = pending_writers[0]
+        response = PermissionResponse(Action.DENY, "Denied later")
+        await send_response(pending_writer, response)
 
-            # Now send response through stored writer
-            req, pending_writer = pending_writers[0]
-            response = PermissionResponse(Action.DENY, "Denied later")
-            await send_response(pending_writer, response)
+        # Read response
+        async with asyncio.timeout(5.0):
+            response_data = await reader.readline()
+        parsed = json.loads(response_data.decode())
 
-            # Read response
-            response_data = await asyncio.wait_for(reader.readline(), timeout=5.0)
-            parsed = json.loads(response_data.decode())
-
-            assert parsed["action"] == "deny"
-            assert parsed["reason"] == "Denied later"
-
-        finally:
-            await server.stop()
+        assert parsed["action"] == "deny"
+        assert parsed["reason"] == "Denied later"
+        writer.close()
 
 
 class TestStateManagerIntegration:
@@ -194,12 +234,11 @@ class TestStateManagerIntegration:
     async def test_pending_request_lifecycle(self) -> None:
         """Test adding, updating, and removing pending requests."""
         state = StateManager()
-        mock_writer = MagicMock(spec=asyncio.StreamWriter)
 
         # Add request
         request = PermissionRequest.create("Bash", {"command": "test"})
-        pending = PendingRequest(request=request, hook_writer=mock_writer)
-        await state.add_pending_request(pending)
+        pending = PendingRequest(request=request, hook_writer=_MOCK_WRITER)
+        state.add_pending_request_nowait(pending)
 
         # Get request
         retrieved = await state.get_pending_request(request.request_id)
@@ -223,32 +262,35 @@ class TestStateManagerIntegration:
     async def test_clear_pending_with_callback(self) -> None:
         """Test clearing pending requests when idle state changes."""
         state = StateManager()
-        mock_writer = MagicMock(spec=asyncio.StreamWriter)
         cleared_on_active = []
 
         async def on_active(idle: bool):
             if not idle:  # User became active
-                pending = await state.get_all_pending_requests()
-                cleared_on_active.extend(pending)
-                await state.clear_all_pending()
+                cleared_on_active.extend(state.get_all_pending_requests_nowait())
+                state.clear_all_pending_nowait()
 
         state.register_idle_callback(on_active)
 
-        # Add some pending requests
-        for i in range(3):
-            request = PermissionRequest.create(f"Tool{i}", {})
-            pending = PendingRequest(request=request, hook_writer=mock_writer)
-            await state.add_pending_request(pending)
+        # Add some pending requests (already on the loop, no lock needed)
+        pendings = [
+            PendingRequest(
+                request=PermissionRequest.create(f"Tool{i}", {}),
+                hook_writer=_MOCK_WRITER,
+            )
+            for i in range(3)
+        ]
+        for pending in pendings:
+            state.add_pending_request_nowait(pending)
 
         # Set idle then active
         await state.set_idle(True)
         await state.set_idle(False)
 
         # Should have captured all pending before clearing
-        assert len(cleared_on_active) == 3
+        assert cleared_on_active == pendings
 
         # Should be empty now
-        assert len(await state.get_all_pending_requests()) == 0
+        assert len(state.get_all_pending_requests_nowait()) == 0
 
 
 class TestHookScript:
@@ -256,18 +298,15 @@ class TestHookScript:
 
     async def test_hook_passthrough_no_daemon(self, temp_dir: Path) -> None:
         """Test hook returns passthrough when daemon not running."""
-        from claude_permission_daemon.hook import connect_to_daemon
-
         # Socket doesn't exist
         socket_path = temp_dir / "nonexistent.sock"
 
         result = connect_to_daemon(socket_path, timeout=5)
         assert result is None
 
+    @pytest.mark.fast
     def test_hook_format_output_approve(self) -> None:
         """Test hook formats approve response correctly."""
-        from claude_permission_daemon.hook import format_output
-
         response = {"action": "approve", "reason": "Approved via Slack"}
         output = format_output(response)
 
@@ -276,10 +315,9 @@ class TestHookScript:
         assert data["hookSpecificOutput"]["hookEventName"] == "PermissionRequest"
         assert data["hookSpecificOutput"]["decision"]["behavior"] == "allow"
 
+    @pytest.mark.fast
     def test_hook_format_output_deny(self) -> None:
         """Test hook formats deny response correctly."""
-        from claude_permission_daemon.hook import format_output
-
         response = {"action": "deny", "reason": "Denied via Slack"}
         output = format_output(response)
 
@@ -288,72 +326,65 @@ class TestHookScript:
         assert data["hookSpecificOutput"]["hookEventName"] == "PermissionRequest"
         assert data["hookSpecificOutput"]["decision"]["behavior"] == "deny"
 
+    @pytest.mark.fast
     def test_hook_format_output_passthrough(self) -> None:
         """Test hook returns None for passthrough."""
-        from claude_permission_daemon.hook import format_output
-
         response = {"action": "passthrough", "reason": "User active"}
         output = format_output(response)
         assert output is None
 
+    @pytest.mark.fast
     def test_hook_format_output_unknown(self) -> None:
         """Test hook returns None for unknown action."""
-        from claude_permission_daemon.hook import format_output
-
         response = {"action": "unknown", "reason": "Something"}
         output = format_output(response)
         assert output is None
 
+    @pytest.mark.fast
     def test_hook_read_request_empty(self) -> None:
         """Test reading empty stdin returns None."""
-        from claude_permission_daemon.hook import read_request_from_stdin
-        from io import StringIO
-        import sys
-
-        old_stdin = sys.stdin
-        sys.stdin = StringIO("")
-        try:
-            result = read_request_from_stdin()
-            assert result is None
-        finally:
-            sys.stdin = old_stdin
+        result = read_request_from_stdin(StringIO(""))
+        assert result is None
 
+    @pytest.mark.fast
     def test_hook_read_request_valid(self) -> None:
         """Test reading valid JSON from stdin."""
-        from claude_permission_daemon.hook import read_request_from_stdin
-        from io import StringIO
-        import sys
-
-        old_stdin = sys.stdin
-        sys.stdin = StringIO('{"tool_name": "Bash", "tool_input": {"command": "test"}}')
-        try:
-            result = read_request_from_stdin()
-            assert result is not None
-            assert result["tool_name"] == "Bash"
-        finally:
-            sys.stdin = old_stdin
+        stream = StringIO('{"tool_name": "Bash", "tool_input": {"command": "test"}}')
+        result = read_request_from_stdin(stream)
+        assert result is not None
+        assert result["tool_name"] == "Bash"
 
+    @pytest.mark.fast
     def test_hook_read_request_invalid_json(self) -> None:
         """Test reading invalid JSON returns None."""
-        from claude_permission_daemon.hook import read_request_from_stdin
-        from io import StringIO
-        import sys
-
-        old_stdin = sys.stdin
-        sys.stdin = StringIO("not valid json")
-        try:
-            result = read_request_from_stdin()
-            assert result is None
-        finally:
-            sys.stdin = old_stdin
+        result = read_request_from_stdin(StringIO("not valid json"))
+        assert result is None
 
 
+@pytest.mark.integration
 class TestEndToEndFlow:
     """End-to-end flow tests using socket server."""
 
-    async def test_approve_flow(self, temp_dir: Path) -> None:
-        """Test complete approve flow through socket."""
-        socket_path = temp_dir / "test.sock"
+    @pytest.mark.parametrize(
+        "wire_request, action, reason, expected_behavior",
+        [
+            # Idle: would post to Slack and wait; here approved immediately
+            (_BASH_NPM_INSTALL_REQUEST, Action.APPROVE, "Approved via Slack", "allow"),
+            (_BASH_RM_RF_REQUEST, Action.DENY, "Denied via Slack", "deny"),
+            # Active: passthrough means no output (Claude Code shows local prompt)
+            (_BASH_ECHO_TEST_REQUEST, Action.PASSTHROUGH, "User active locally", None),
+        ],
+        ids=["approve", "deny", "passthrough"],
+    )
+    async def test_flow(
+        self,
+        shared_server: SharedServer,
+        wire_request: bytes,
+        action: Action,
+        reason: str,
+        expected_behavior: str | None,
+    ) -> None:
+        """Test complete approve/deny/passthrough flow through socket."""
 
         # Simulate daemon behavior
         async def daemon_handler(
@@ -361,107 +392,27 @@ class TestEndToEndFlow:
             reader: asyncio.StreamReader,
             writer: asyncio.StreamWriter,
         ):
-            # Simulate "idle" state - would post to Slack and wait for approval
-            # For testing, just approve immediately
-            response = PermissionResponse(Action.APPROVE, "Approved via Slack")
-            await send_response(writer, response)
-
-        server = SocketServer(socket_path=socket_path, on_request=daemon_handler)
-        await server.start()
-
-        try:
-            # Simulate hook script behavior
-            reader, writer = await asyncio.open_unix_connection(str(socket_path))
-
-            request = {
-                "tool_name": "Bash",
-                "tool_input": {"command": "npm install lodash"},
-            }
-            writer.write(json.dumps(request).encode() + b"\n")
-            await writer.drain()
-
-            response_data = await asyncio.wait_for(reader.readline(), timeout=5.0)
-            response = json.loads(response_data.decode())
-
-            # Hook would output this as Claude Code format
-            from claude_permission_daemon.hook import format_output
-            output = format_output(response)
-
-            assert output is not None
-            claude_response = json.loads(output)
-            assert claude_response["hookSpecificOutput"]["hookEventName"] == "PermissionRequest"
-            assert claude_response["hookSpecificOutput"]["decision"]["behavior"] == "allow"
-
-        finally:
-            await server.stop()
-
-    async def test_deny_flow(self, temp_dir: Path) -> None:
-        """Test complete deny flow through socket."""
-        socket_path = temp_dir / "test.sock"
-
-        async def daemon_handler(
-            request: PermissionRequest,
-            reader: asyncio.StreamReader,
-            writer: asyncio.StreamWriter,
-        ):
-            response = PermissionResponse(Action.DENY, "Denied via Slack")
-            await send_response(writer, response)
+            await send_response(writer, PermissionResponse(action, reason))
 
-        server = SocketServer(socket_path=socket_path, on_request=daemon_handler)
-        await server.start()
+        socket_path, set_handler = shared_server
+        set_handler(daemon_handler)
 
-        try:
-            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        # Simulate hook script behavior
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
 
-            request = {"tool_name": "Bash", "tool_input": {"command": "rm -rf /"}}
-            writer.write(json.dumps(request).encode() + b"\n")
-            await writer.drain()
+        await send_json(writer, wire_request)
 
-            response_data = await asyncio.wait_for(reader.readline(), timeout=5.0)
-            response = json.loads(response_data.decode())
+        async with asyncio.timeout(5.0):
+            response_data = await reader.readline()
+        response = json.loads(response_data.decode())
 
-            from claude_permission_daemon.hook import format_output
-            output = format_output(response)
+        # Hook would output this as Claude Code format
+        output = format_output(response)
 
+        if expected_behavior is None:
+            assert output is None
+        else:
             assert output is not None
             claude_response = json.loads(output)
             assert claude_response["hookSpecificOutput"]["hookEventName"] == "PermissionRequest"
-            assert claude_response["hookSpecificOutput"]["decision"]["behavior"] == "deny"
-
-        finally:
-            await server.stop()
-
-    async def test_passthrough_flow(self, temp_dir: Path) -> None:
-        """Test complete passthrough flow (user active)."""
-        socket_path = temp_dir / "test.sock"
-
-        async def daemon_handler(
-            request: PermissionRequest,
-            reader: asyncio.StreamReader,
-            writer: asyncio.StreamWriter,
-        ):
-            # User is active - passthrough
-            response = PermissionResponse(Action.PASSTHROUGH, "User active locally")
-            await send_response(writer, response)
-
-        server = SocketServer(socket_path=socket_path, on_request=daemon_handler)
-        await server.start()
-
-        try:
-            reader, writer = await asyncio.open_unix_connection(str(socket_path))
-
-            request = {"tool_name": "Bash", "tool_input": {"command": "echo test"}}
-            writer.write(json.dumps(request).encode() + b"\n")
-            await writer.drain()
-
-            response_data = await asyncio.wait_for(reader.readline(), timeout=5.0)
-            response = json.loads(response_data.decode())
-
-            from claude_permission_daemon.hook import format_output
-            output = format_output(response)
-
-            # Passthrough means no output (Claude Code shows local prompt)
-            assert output is None
-
-        finally:
-            await server.stop()
+            assert claude_response["hookSpecificOutput"]["decision"]["behavior"] == expected_behavior
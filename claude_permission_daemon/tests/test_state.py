@@ -1,8 +1,8 @@
 """Tests for state module."""
 
-import asyncio
+import functools
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -17,25 +17,51 @@ from claude_permission_daemon.state import (
 )
 
 
-class TestAction:
-    """Tests for Action enum."""
+class _StubWriter:
+    """Stand-in hook writer for pending requests that never write."""
 
-    def test_values(self) -> None:
-        """Test enum values match expected strings."""
-        assert Action.APPROVE.value == "approve"
-        assert Action.DENY.value == "deny"
-        assert Action.PASSTHROUGH.value == "passthrough"
+    __slots__ = ()
 
 
-class TestMessageType:
-    """Tests for MessageType enum."""
+_STUB_WRITER = _StubWriter()
 
-    def test_values(self) -> None:
-        """Test enum values match expected strings."""
-        assert MessageType.PERMISSION_REQUEST.value == "permission_request"
-        assert MessageType.NOTIFICATION.value == "notification"
 
+# Idle callbacks shared across tests; the idle_callbacks fixture resets them.
+_IDLE_CALLBACKS = (AsyncMock(), AsyncMock())
 
+
+@functools.cache
+def _bash_request() -> PermissionRequest:
+    """Build the Bash request shared by read-only tests once per run."""
+    return PermissionRequest.create("Bash", {"command": "test"})
+
+
+@functools.cache
+def _write_request() -> PermissionRequest:
+    """Build the Write request shared by read-only tests once per run."""
+    return PermissionRequest.create(
+        "Write",
+        {"file_path": "/tmp/test.txt", "content": "hello"},
+    )
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize(
+    ("member", "value"),
+    [
+        (Action.APPROVE, "approve"),
+        (Action.DENY, "deny"),
+        (Action.PASSTHROUGH, "passthrough"),
+        (MessageType.PERMISSION_REQUEST, "permission_request"),
+        (MessageType.NOTIFICATION, "notification"),
+    ],
+)
+def test_enum_values(member: Action | MessageType, value: str) -> None:
+    """Test enum values match expected strings."""
+    assert member.value == value
+
+
+@pytest.mark.fast
 class TestPermissionRequest:
     """Tests for PermissionRequest dataclass."""
 
@@ -57,16 +83,14 @@ class TestPermissionRequest:
 
     def test_stores_tool_info(self) -> None:
         """Test tool_name and tool_input are stored."""
-        req = PermissionRequest.create(
-            "Write",
-            {"file_path": "/tmp/test.txt", "content": "hello"},
-        )
+        req = _write_request()
 
         assert req.tool_name == "Write"
         assert req.tool_input["file_path"] == "/tmp/test.txt"
         assert req.tool_input["content"] == "hello"
 
 
+@pytest.mark.fast
 class TestNotification:
     """Tests for Notification dataclass."""
 
@@ -104,50 +128,40 @@ class TestNotification:
         assert notif.cwd is None
 
 
+@pytest.mark.fast
 class TestPermissionResponse:
     """Tests for PermissionResponse dataclass."""
 
-    def test_to_dict_approve(self) -> None:
-        """Test to_dict() for approve action."""
-        resp = PermissionResponse(Action.APPROVE, "Approved via Slack")
-        d = resp.to_dict()
-
-        assert d["action"] == "approve"
-        assert d["reason"] == "Approved via Slack"
-
-    def test_to_dict_deny(self) -> None:
-        """Test to_dict() for deny action."""
-        resp = PermissionResponse(Action.DENY, "Denied via Slack")
-        d = resp.to_dict()
+    @pytest.mark.parametrize(
+        ("action", "reason"),
+        [
+            (Action.APPROVE, "Approved via Slack"),
+            (Action.DENY, "Denied via Slack"),
+            (Action.PASSTHROUGH, "User active locally"),
+        ],
+    )
+    def test_to_dict(self, action: Action, reason: str) -> None:
+        """Test to_dict() serializes action value and reason."""
+        d = PermissionResponse(action, reason).to_dict()
 
-        assert d["action"] == "deny"
-        assert d["reason"] == "Denied via Slack"
-
-    def test_to_dict_passthrough(self) -> None:
-        """Test to_dict() for passthrough action."""
-        resp = PermissionResponse(Action.PASSTHROUGH, "User active locally")
-        d = resp.to_dict()
-
-        assert d["action"] == "passthrough"
-        assert d["reason"] == "User active locally"
+        assert d == {"action": action.value, "reason": reason}
 
 
+@pytest.mark.fast
 class TestPendingRequest:
     """Tests for PendingRequest dataclass."""
 
     def test_request_id_property(self) -> None:
         """Test request_id property delegates to request."""
-        mock_writer = MagicMock(spec=asyncio.StreamWriter)
-        req = PermissionRequest.create("Bash", {"command": "test"})
-        pending = PendingRequest(request=req, hook_writer=mock_writer)
+        req = _bash_request()
+        pending = PendingRequest(request=req, hook_writer=_STUB_WRITER)
 
         assert pending.request_id == req.request_id
 
     def test_slack_info_optional(self) -> None:
         """Test Slack info fields default to None."""
-        mock_writer = MagicMock(spec=asyncio.StreamWriter)
-        req = PermissionRequest.create("Bash", {"command": "test"})
-        pending = PendingRequest(request=req, hook_writer=mock_writer)
+        req = _bash_request()
+        pending = PendingRequest(request=req, hook_writer=_STUB_WRITER)
 
         assert pending.slack_message_ts is None
         assert pending.slack_channel is None
@@ -156,17 +170,30 @@ class TestPendingRequest:
 class TestStateManager:
     """Tests for StateManager class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def state_manager(self) -> StateManager:
-        """Create a fresh StateManager for each test."""
+        """Create one StateManager shared by every test in the class."""
         return StateManager()
 
+    @pytest.fixture(autouse=True)
+    def reset_state_manager(self, state_manager: StateManager) -> None:
+        """Return the shared StateManager to its initial state before each test."""
+        state_manager._idle = False
+        state_manager._idle_since = datetime.now(UTC)
+        state_manager._pending_requests.clear()
+        state_manager._idle_callbacks.clear()
+
+    @pytest.fixture
+    def idle_callbacks(self) -> tuple[AsyncMock, AsyncMock]:
+        """Return the shared idle callbacks with calls and side effects cleared."""
+        for callback in _IDLE_CALLBACKS:
+            callback.reset_mock(side_effect=True)
+        return _IDLE_CALLBACKS
+
     @pytest.fixture
     def mock_pending_request(self) -> PendingRequest:
         """Create a mock PendingRequest."""
-        mock_writer = MagicMock(spec=asyncio.StreamWriter)
-        req = PermissionRequest.create("Bash", {"command": "test"})
-        return PendingRequest(request=req, hook_writer=mock_writer)
+        return PendingRequest(request=_bash_request(), hook_writer=_STUB_WRITER)
 
     async def test_initial_idle_state(self, state_manager: StateManager) -> None:
         """Test initial idle state is False."""
@@ -184,10 +211,12 @@ class TestStateManager:
         assert state_manager.idle is False
 
     async def test_set_idle_no_change_no_callback(
-        self, state_manager: StateManager
+        self,
+        state_manager: StateManager,
+        idle_callbacks: tuple[AsyncMock, AsyncMock],
     ) -> None:
         """Test callback not called when idle state doesn't change."""
-        callback = AsyncMock()
+        callback, _ = idle_callbacks
         state_manager.register_idle_callback(callback)
 
         # Set to False when already False - no callback
@@ -195,10 +224,12 @@ class TestStateManager:
         callback.assert_not_called()
 
     async def test_idle_callback_called_on_change(
-        self, state_manager: StateManager
+        self,
+        state_manager: StateManager,
+        idle_callbacks: tuple[AsyncMock, AsyncMock],
     ) -> None:
         """Test callback is called when idle state changes."""
-        callback = AsyncMock()
+        callback, _ = idle_callbacks
         state_manager.register_idle_callback(callback)
 
         await state_manager.set_idle(True)
@@ -208,13 +239,15 @@ class TestStateManager:
         await state_manager.set_idle(False)
         callback.assert_called_once_with(False)
 
-    async def test_multiple_callbacks(self, state_manager: StateManager) -> None:
+    async def test_multiple_callbacks(
+        self,
+        state_manager: StateManager,
+        idle_callbacks: tuple[AsyncMock, AsyncMock],
+    ) -> None:
         """Test multiple callbacks are all called."""
-        callback1 = AsyncMock()
-        callback2 = AsyncMock()
+        callback1, callback2 = idle_callbacks
 
-        state_manager.register_idle_callback(callback1)
-        state_manager.register_idle_callback(callback2)
+        state_manager.register_idle_callbacks([callback1, callback2])
 
         await state_manager.set_idle(True)
 
@@ -222,14 +255,15 @@ class TestStateManager:
         callback2.assert_called_once_with(True)
 
     async def test_callback_exception_doesnt_break_others(
-        self, state_manager: StateManager
+        self,
+        state_manager: StateManager,
+        idle_callbacks: tuple[AsyncMock, AsyncMock],
     ) -> None:
         """Test that one callback raising doesn't prevent others."""
-        callback1 = AsyncMock(side_effect=Exception("test error"))
-        callback2 = AsyncMock()
+        callback1, callback2 = idle_callbacks
+        callback1.side_effect = Exception("test error")
 
-        state_manager.register_idle_callback(callback1)
-        state_manager.register_idle_callback(callback2)
+        state_manager.register_idle_callbacks([callback1, callback2])
 
         await state_manager.set_idle(True)
 
@@ -280,10 +314,10 @@ class TestStateManager:
         self, state_manager: StateManager
     ) -> None:
         """Test getting all pending requests."""
-        mock_writer = MagicMock(spec=asyncio.StreamWriter)
+        mock_writer = _STUB_WRITER
 
-        req1 = PermissionRequest.create("Bash", {"command": "cmd1"})
-        req2 = PermissionRequest.create("Write", {"file_path": "/tmp/test"})
+        req1 = _bash_request()
+        req2 = _write_request()
 
         pending1 = PendingRequest(request=req1, hook_writer=mock_writer)
         pending2 = PendingRequest(request=req2, hook_writer=mock_writer)
@@ -308,12 +342,8 @@ class TestStateManager:
             channel="C12345678",
         )
 
-        pending = await state_manager.get_pending_request(
-            mock_pending_request.request_id
-        )
-        assert pending is not None
-        assert pending.slack_message_ts == "1234567890.123456"
-        assert pending.slack_channel == "C12345678"
+        assert mock_pending_request.slack_message_ts == "1234567890.123456"
+        assert mock_pending_request.slack_channel == "C12345678"
 
     async def test_update_slack_info_nonexistent(
         self, state_manager: StateManager
@@ -332,32 +362,28 @@ class TestStateManager:
         """Test setting monitor task for a pending request."""
         await state_manager.add_pending_request(mock_pending_request)
 
-        mock_task = MagicMock(spec=asyncio.Task)
+        mock_task = object()
         await state_manager.set_monitor_task(
             mock_pending_request.request_id,
             mock_task,
         )
 
-        pending = await state_manager.get_pending_request(
-            mock_pending_request.request_id
-        )
-        assert pending is not None
-        assert pending.monitor_task is mock_task
+        assert mock_pending_request.monitor_task is mock_task
 
     async def test_set_monitor_task_nonexistent(
         self, state_manager: StateManager
     ) -> None:
         """Test setting monitor task for nonexistent request does nothing."""
-        mock_task = MagicMock(spec=asyncio.Task)
+        mock_task = object()
         # Should not raise
         await state_manager.set_monitor_task("nonexistent-id", mock_task)
 
     async def test_clear_all_pending(self, state_manager: StateManager) -> None:
         """Test clearing all pending requests."""
-        mock_writer = MagicMock(spec=asyncio.StreamWriter)
+        mock_writer = _STUB_WRITER
 
-        req1 = PermissionRequest.create("Bash", {"command": "cmd1"})
-        req2 = PermissionRequest.create("Write", {"file_path": "/tmp/test"})
+        req1 = _bash_request()
+        req2 = _write_request()
 
         pending1 = PendingRequest(request=req1, hook_writer=mock_writer)
         pending2 = PendingRequest(request=req2, hook_writer=mock_writer)
@@ -372,6 +398,25 @@ class TestStateManager:
         all_pending = await state_manager.get_all_pending_requests()
         assert len(all_pending) == 0
 
+    def test_pending_nowait_variants(self, state_manager: StateManager) -> None:
+        """Test lock-free variants add, list, and clear pending requests."""
+        mock_writer = _STUB_WRITER
+
+        req1 = _bash_request()
+        req2 = _write_request()
+
+        pending1 = PendingRequest(request=req1, hook_writer=mock_writer)
+        pending2 = PendingRequest(request=req2, hook_writer=mock_writer)
+
+        state_manager.add_pending_request_nowait(pending1)
+        state_manager.add_pending_request_nowait(pending2)
+
+        assert state_manager.get_all_pending_requests_nowait() == [pending1, pending2]
+
+        cleared = state_manager.clear_all_pending_nowait()
+        assert cleared == [pending1, pending2]
+        assert state_manager.get_all_pending_requests_nowait() == []
+
     async def test_idle_since_initial(self, state_manager: StateManager) -> None:
         """Test idle_since is set on initialization."""
         # Should be close to now
@@ -382,16 +427,15 @@ class TestStateManager:
         self, state_manager: StateManager
     ) -> None:
         """Test idle_since updates when state changes."""
-        initial_since = state_manager.idle_since
-
-        # Small delay to ensure time difference
-        await asyncio.sleep(0.01)
+        # Backdate the current state instead of sleeping for a clock tick
+        initial_since = state_manager.idle_since - timedelta(seconds=1)
+        state_manager._idle_since = initial_since
 
         await state_manager.set_idle(True)
         assert state_manager.idle_since > initial_since
 
-        idle_since = state_manager.idle_since
-        await asyncio.sleep(0.01)
+        idle_since = state_manager.idle_since - timedelta(seconds=1)
+        state_manager._idle_since = idle_since
 
         await state_manager.set_idle(False)
         assert state_manager.idle_since > idle_since
@@ -401,62 +445,39 @@ class TestStateManager:
     ) -> None:
         """Test idle_since doesn't change when setting same state."""
         await state_manager.set_idle(True)
-        idle_since = state_manager.idle_since
+        idle_since = state_manager.idle_since - timedelta(seconds=1)
+        state_manager._idle_since = idle_since
 
-        await asyncio.sleep(0.01)
         await state_manager.set_idle(True)  # Same state
 
         assert state_manager.idle_since == idle_since
 
     async def test_state_duration_seconds(self, state_manager: StateManager) -> None:
         """Test state_duration_seconds returns time since last change."""
-        # Wait a bit
-        await asyncio.sleep(0.05)
-        duration = state_manager.state_duration_seconds
-        assert duration >= 0.05
-
-    async def test_get_state_description_seconds(
-        self, state_manager: StateManager
-    ) -> None:
-        """Test get_state_description for short durations."""
-        # Mock the datetime to control duration
-        fixed_time = datetime.now(UTC)
-        with patch.object(
-            state_manager, "_idle_since", fixed_time - timedelta(seconds=30)
-        ):
-            desc = state_manager.get_state_description()
-            assert "active for 30s" in desc
-
-    async def test_get_state_description_minutes(
-        self, state_manager: StateManager
-    ) -> None:
-        """Test get_state_description for minute durations."""
-        fixed_time = datetime.now(UTC)
         with patch.object(
-            state_manager, "_idle_since", fixed_time - timedelta(minutes=5, seconds=30)
+            state_manager, "_idle_since", datetime.now(UTC) - timedelta(seconds=0.05)
         ):
-            desc = state_manager.get_state_description()
-            assert "active for 5m 30s" in desc
-
-    async def test_get_state_description_hours(
-        self, state_manager: StateManager
-    ) -> None:
-        """Test get_state_description for hour durations."""
-        fixed_time = datetime.now(UTC)
-        with patch.object(
-            state_manager, "_idle_since", fixed_time - timedelta(hours=2, minutes=15)
-        ):
-            desc = state_manager.get_state_description()
-            assert "active for 2h 15m" in desc
+            duration = state_manager.state_duration_seconds
+        assert duration >= 0.05
 
-    async def test_get_state_description_idle_state(
-        self, state_manager: StateManager
+    @pytest.mark.parametrize(
+        ("idle", "delta", "expected"),
+        [
+            (False, timedelta(seconds=30), "active for 30s"),
+            (False, timedelta(minutes=5, seconds=30), "active for 5m 30s"),
+            (False, timedelta(hours=2, minutes=15), "active for 2h 15m"),
+            (True, timedelta(seconds=45), "idle for 45s"),
+        ],
+        ids=["seconds", "minutes", "hours", "idle_state"],
+    )
+    async def test_get_state_description(
+        self,
+        state_manager: StateManager,
+        idle: bool,
+        delta: timedelta,
+        expected: str,
     ) -> None:
-        """Test get_state_description shows 'idle' when idle."""
-        await state_manager.set_idle(True)
-        fixed_time = datetime.now(UTC)
-        with patch.object(
-            state_manager, "_idle_since", fixed_time - timedelta(seconds=45)
-        ):
-            desc = state_manager.get_state_description()
-            assert "idle for 45s" in desc
+        """Test get_state_description formats state and duration."""
+        await state_manager.set_idle(idle)
+        with patch.object(state_manager, "_idle_since", datetime.now(UTC) - delta):
+            assert expected in state_manager.get_state_description()